@@ -92,23 +92,15 @@ def read_configs(config_file):
     return configs
 
 
-def log_entry(entry, configs):
-    """Makes a UTC time stamped entry into the log file.
-
-       Handles the creation of a new log file if required.
-    """
-    timestamp = datetime.datetime.utcnow()
-    timestmap_file_base = configs['log_filename']
-    timestamp_file = '{0}-{1}.log'.format(timestmap_file_base, timestamp.strftime('%d-%m-%Y'))
-    log_file = os.path.join(configs['log_dir'], timestamp_file)
-    with open(log_file, 'a') as log_f:
-        log_f.write('{0} {1}\n'.format(timestamp.strftime(LOG_TIMESTAMP_FORMAT), entry))
-
 class TimeSheet(object):
 
     def __init__(self, configs, master):
         self.configs = configs
 
+        # Log file currently open for appending and the (UTC) date it is for.
+        self._log_fh = None
+        self._log_date = None
+
         # Set up app window.
         self.master = master
         self.frame = Frame(master)
@@ -122,10 +114,11 @@ class TimeSheet(object):
         self.activity_categories = sorted(configs['categories'].keys())
         default_activity_index = self.activity_categories.index(configs['default_category'])
         if configs['long-definitions']:
-           activity_categories_display = ['{0}: {1}'.format(category, configs['categories'][category]) for category in self.activity_categories]
+            activity_categories_display = ['{0}: {1}'.format(category, configs['categories'][category]) for category in self.activity_categories]
         else:
-           activity_categories_display = self.activity_categories
-        text_length = max([len(i) for i in activity_categories_display])
+            activity_categories_display = self.activity_categories
+        self._display_to_short = dict(zip(activity_categories_display, self.activity_categories))
+        text_length = max(map(len, activity_categories_display))
         self.activityBox = Combobox(self.frame, width=text_length)
         self.activityBox['values'] = activity_categories_display
         self.activityBox.current(default_activity_index)
@@ -137,22 +130,40 @@ class TimeSheet(object):
         self.quit.grid(row=2, column=0)
 
         # Log the default entry which is set up upon startup.
-        log_entry(self.configs['default_category'], configs)
+        self.log_entry(self.configs['default_category'])
+
+    def log_entry(self, entry):
+        """Makes a UTC time stamped entry into the log file."""
+        self._write(datetime.datetime.now(datetime.timezone.utc), entry)
+
+    def _write(self, ts, entry):
+        """Append the entry to the log file for the time stamp's date.
+
+           The log file is kept open between entries. Handles the creation
+           of a new log file when the date changes.
+        """
+        if self._log_fh is None or ts.date() != self._log_date:
+            if self._log_fh is not None:
+                self._log_fh.close()
+            timestamp_file = f"{self.configs['log_filename']}-{ts:%d-%m-%Y}.log"
+            self._log_fh = open(os.path.join(self.configs['log_dir'], timestamp_file), 'a')
+            self._log_date = ts.date()
+        self._log_fh.write(f'{ts:{LOG_TIMESTAMP_FORMAT}} {entry}\n')
+        self._log_fh.flush()
 
     def log_activity(self, evt):
         """New activity selected, log it"""
         activity = self.activityBox.get()
-        # If we are using long activities, need to get the short name
-        if self.configs['long-definitions']:
-            for short_name in self.activity_categories:
-                if activity.startswith(short_name):
-                    activity = short_name
-                    break
-        log_entry(activity, self.configs)
+        # Map the displayed label (short or long form) to the short name. Text
+        # typed into the box that is not one of the labels is logged unchanged.
+        activity = self._display_to_short.get(activity, activity)
+        self.log_entry(activity)
 
     def end(self):
         """Log default activity prior to quiting."""
-        log_entry(self.configs['default_category'], self.configs)
+        self.log_entry(self.configs['default_category'])
+        self._log_fh.close()
+        self._log_fh = None
         self.frame.quit()
 
 
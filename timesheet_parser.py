@@ -1,16 +1,17 @@
-#! /usr/bin/env python2.7
+#! /usr/bin/env python
 
-import collections
 from copy import deepcopy
 import datetime
-from dateutil import tz
+import functools
+import mmap
+import numpy as np
+from operator import itemgetter
 import re
 import os
 import sys
 
-from pylab import *
-
-LOG_FILE_FORMAT = 'timesheet-\d\d\-\d\d-\d\d\d\d.log'
+LOG_FILE_FORMAT = r'timesheet-\d\d-\d\d-\d\d\d\d\.log$'
+_LOG_FILE_RE = re.compile(LOG_FILE_FORMAT)
 LOG_TIMESTAMP_FORMAT = '%Y%m%d%H%M%S'
 NUM_TO_DAY_MAP = {1: 'mon',
                   2: 'tue',
@@ -22,43 +23,135 @@ NUM_TO_DAY_MAP = {1: 'mon',
 PERCENTAGE_CUTOFF = 5
 
 
+def _format_week(week_key):
+    """Format a year * 100 + week number key for display, eg. 2017-05"""
+    return '{0}-{1:02d}'.format(week_key // 100, week_key % 100)
+
+
+def _fast_parse_ts(ts):
+    """Parse a LOG_TIMESTAMP_FORMAT time stamp into a datetime.
+
+    Slicing out the fixed width fields is much faster than strptime which
+    matters as every log entry is parsed.
+    """
+    return datetime.datetime(int(ts[0:4]), int(ts[4:6]), int(ts[6:8]),
+                             int(ts[8:10]), int(ts[10:12]), int(ts[12:14]))
+
+
+def _read_log_entries(log_file):
+    """A generator which yields a tuple of (time stamp, activity) for each entry in the log file.
+
+    The log file is memory mapped and split on the raw bytes rather than
+    read into a list of lines. The time stamp is left as bytes since it is
+    only handed on to _fast_parse_ts.
+    """
+
+    fd = os.open(log_file, os.O_RDONLY)
+    try:
+        if os.fstat(fd).st_size == 0:  # Cannot mmap an empty file
+            return
+        mm = mmap.mmap(fd, 0, prot=mmap.PROT_READ)
+        try:
+            if hasattr(mm, 'madvise'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            pos = 0
+            size = mm.size()
+            while pos < size:
+                nl = mm.find(b'\n', pos)
+                if nl < 0:  # Last entry is missing its newline
+                    nl = size
+                line = mm[pos:nl]
+                pos = nl + 1
+                if not line:
+                    continue
+                sp = line.find(b' ')
+                if sp < 0:
+                    print('Skipping malformed log entry: ', line.decode(errors='replace'), ' File:', log_file)
+                    continue
+                yield line[:sp], line[sp + 1:].decode()
+        finally:
+            mm.close()
+    finally:
+        os.close(fd)
+
+
+@functools.lru_cache(maxsize=1)
 def get_activities_in_localtime(log_dir='/Users/amacleod/.tt/logs'):
     """Parse the activity logs which are in UTC and convert to local time
 
     :param str log_dir:   Directory in which the time stamped log files are stored.
 
-    :returns: A dictionary of local time stamps and activity engaged in at that time.
-    :rtype:  dict
+    :returns: A list of (local (naive) datetime, activity engaged in at that time) tuples,
+              ordered by the local time stamp.
+    :rtype:  list
     """
 
-    log_files = [f for f in os.listdir(log_dir) if re.match(LOG_FILE_FORMAT, f)]
-    localtime_activities = {}
-    from_zone = tz.tzutc()
-    to_zone = tz.tzlocal()
+    # Directory entries carry the file type so no extra stat() is needed
+    with os.scandir(log_dir) as dir_entries:
+        log_files = [f.path for f in dir_entries if f.is_file() and _LOG_FILE_RE.match(f.name)]
+    localtime_activities = []
+    # Local offset for each UTC minute seen. Offset changes happen on a minute
+    # boundary (at :30 UTC for half hour zones like America/St_Johns), so a
+    # single conversion per minute replaces one per entry.
+    utc_offsets = {}
     for f in log_files:
-        with open(os.path.join(log_dir, f), 'r') as f_p:
-            for entry in f_p.readlines():
-                ts, activity = entry[:-1].split(' ')
-                try:
-                    utc_ts = datetime.datetime.strptime(ts, LOG_TIMESTAMP_FORMAT)
-                except ValueError as e:
-                    print('Issue converting timestamp: ', ts, ' Format:', LOG_TIMESTAMP_FORMAT)
-                    sys.exc_traceback()
-
-                utc_ts = utc_ts.replace(tzinfo=from_zone)
-                local_ts = utc_ts.astimezone(to_zone)
-                localtime_activities[local_ts.strftime(LOG_TIMESTAMP_FORMAT)] = activity
+        for ts, activity in _read_log_entries(f):
+            try:
+                utc_ts = _fast_parse_ts(ts)
+            except ValueError as e:
+                print('Issue converting timestamp: ', ts.decode(), ' Format:', LOG_TIMESTAMP_FORMAT)
+                sys.exc_traceback()
+
+            utc_minute = ts[:12]
+            utc_offset = utc_offsets.get(utc_minute)
+            if utc_offset is None:
+                utc_minute_ts = datetime.datetime(utc_ts.year, utc_ts.month, utc_ts.day, utc_ts.hour,
+                                                  utc_ts.minute, tzinfo=datetime.timezone.utc)
+                utc_offset = utc_minute_ts.astimezone().utcoffset()  # System local time zone
+                utc_offsets[utc_minute] = utc_offset
+            localtime_activities.append((utc_ts + utc_offset, activity))
+    localtime_activities.sort(key=itemgetter(0))  # Stable, so duplicates stay in logged order
     return localtime_activities
 
 
+@functools.lru_cache(maxsize=1)
 def get_ordered_activity_timestamps():
-    """Return dict of timestamp and activities in reverse order. Order is based on the local timestamp of the activities."""
+    """Return list of timestamp and activities. Order is based on the local timestamp of the activities.
+
+    Switching activities more than once within a second logs duplicate
+    time stamps; only the last activity logged for a time stamp is kept.
+    """
 
-    ordered_timestamps = collections.OrderedDict(sorted(get_activities_in_localtime().items(), key=lambda t: t[0]))
-    ordered_timestamps = [x for x in ordered_timestamps.items()]
+    ordered_timestamps = []
+    for entry in get_activities_in_localtime():
+        if ordered_timestamps and ordered_timestamps[-1][0] == entry[0]:
+            ordered_timestamps[-1] = entry
+        else:
+            ordered_timestamps.append(entry)
     return ordered_timestamps
 
 
+@functools.lru_cache(maxsize=1)
+def _get_all_activity_timings():
+    """Return a list of (activity, year, week number, day of week, total seconds, start time, end time).
+
+    The list is in the same order as yielded by get_activity_timings and
+    includes the "Off" activities. It is computed once and cached since
+    parsing the logs is the most expensive part of any report.
+    """
+
+    all_timings = []
+    ordered_timestamps = get_ordered_activity_timestamps()
+    for x in range(len(ordered_timestamps) - 1, 1, -1):
+        end_time, end_activity = ordered_timestamps[x]
+        start_time, start_activity = ordered_timestamps[x - 1]
+        time_diff = end_time - start_time
+        time_delta = time_diff.days * 24 * 3600 + time_diff.seconds
+        year, week_number, day_of_week = end_time.isocalendar()
+        all_timings.append((start_activity, year, week_number, day_of_week, time_delta, start_time, end_time))
+    return all_timings
+
+
 def get_activity_timings(filter_off=True):
     """A generator which yields a tuple of (activity, year, week number, day of week, total seconds).
 
@@ -70,25 +163,48 @@ def get_activity_timings(filter_off=True):
     By default, "Off" activities are filtered from the results.
     """
 
-    ordered_timestamps = get_ordered_activity_timestamps()
-    for x in range(len(ordered_timestamps) - 1, 1, -1):
-        end_ts, end_activity = ordered_timestamps[x]
-        start_ts, start_activity = ordered_timestamps[x - 1]
+    for start_activity, year, week_number, day_of_week, time_delta, start_time, end_time in _get_all_activity_timings():
         if filter_off and start_activity == 'Off':  # Skip the off activity
             continue
-        end_time = datetime.datetime.strptime(end_ts, LOG_TIMESTAMP_FORMAT)
-        start_time = datetime.datetime.strptime(start_ts, LOG_TIMESTAMP_FORMAT)
-        time_diff = end_time - start_time
-        time_delta = time_diff.days * 24 * 3600 + time_diff.seconds
         if time_delta > 15 * 3600:  # more then 15 hours
+            start_ts = start_time.strftime(LOG_TIMESTAMP_FORMAT)
+            end_ts = end_time.strftime(LOG_TIMESTAMP_FORMAT)
             warning_msg = 'Warning: Probably an issue with activity {0} entry starting {1}, ending {2}'.format(start_activity, start_ts, end_ts)
             hrs = int(time_delta/3600.0)
             mins = int((time_delta - (hrs * 3600.0))/60.0)
             print('{0}: {1} hrs, {2} mins'.format(warning_msg, hrs, mins))
-        year, week_number, day_of_week = end_time.isocalendar()
         yield (start_activity, year, week_number, day_of_week, time_delta)
 
 
+@functools.lru_cache(maxsize=1)
+def _load_columns():
+    """Return the activity timings as a dictionary of parallel NumPy arrays.
+
+    The 'activity_code', 'year', 'week', 'dow' and 'delta' arrays follow
+    the get_activity_timings order. Activity codes index into the
+    'code_to_name' list, which is ordered by first appearance.
+    """
+
+    name_to_code = {}
+    codes = []
+    years = []
+    weeks = []
+    days = []
+    deltas = []
+    for activity, yr, week, day_of_week, time_delta in get_activity_timings():
+        codes.append(name_to_code.setdefault(activity, len(name_to_code)))
+        years.append(yr)
+        weeks.append(week)
+        days.append(day_of_week)
+        deltas.append(time_delta)
+    return {'activity_code': np.array(codes, dtype=np.int32),
+            'year': np.array(years, dtype=np.int16),
+            'week': np.array(weeks, dtype=np.int8),
+            'dow': np.array(days, dtype=np.int8),
+            'delta': np.array(deltas, dtype=np.int64),
+            'code_to_name': list(name_to_code)}
+
+
 def get_wow_changes(weeks_ago=1):
     """Return the week over week change for the previous full week.
 
@@ -103,7 +219,8 @@ def get_wow_changes(weeks_ago=1):
 
     :param int weeks_ago:  The number of weeks used to compute the average wow change.
 
-    :returns:  A dictionary of activities and the wow change.
+    :returns:  A dictionary of weeks, in the same order as get_weekly_info,
+               of activities and the wow change.
     :rtype: dict
     """
 
@@ -112,12 +229,12 @@ def get_wow_changes(weeks_ago=1):
 
         def compute_weeks_ago_index(cur_week_index, weeks_ago):
             """Compute the week index from the current week the specific number of weeks ago"""
-            current_yr, current_week = cur_week_index.split('-')
-            prev_week = int(current_week) - weeks_ago
+            current_yr, current_week = divmod(cur_week_index, 100)
+            prev_week = current_week - weeks_ago
             if prev_week < 1:
                 prev_week = 52 + prev_week
-                current_yr = int(current_yr)  - 1
-            return '{0}-{1}'.format(current_yr, prev_week)
+                current_yr -= 1
+            return current_yr * 100 + prev_week
 
         previous_weekly_tally = {}
         active_week_count = {}
@@ -140,23 +257,24 @@ def get_wow_changes(weeks_ago=1):
 
     wow_change = {}
     default_percentage = 0.0
-    current_weekly_info = {}
+    previous_weekly_tallies = {}
     weekly_info = get_weekly_info()
-    for cnt, week in enumerate(sorted(weekly_info.keys())):
+    for cnt, week in enumerate(weekly_info):
         if cnt > weeks_ago:
             wow_change[week] = {}
+            # The previous tally only depends on the week, not the activity
+            if week not in previous_weekly_tallies:
+                previous_weekly_tallies[week] = get_previous_weekly_tally(weeks_ago, week, weekly_info)
+            previous_weekly_tally = previous_weekly_tallies[week]
             for activity in weekly_info[week]:
-                current_weekly_info[activity]= {'count': weekly_info[week][activity]['count'],
-                                                'time':weekly_info[week][activity]['time']}
                 wow_count = default_percentage
                 wow_time = default_percentage
-                previous_weekly_tally = get_previous_weekly_tally(weeks_ago, week, weekly_info)
                 if activity in previous_weekly_tally:
-                    cur = current_weekly_info[activity]['count']
+                    cur = weekly_info[week][activity]['count']
                     prev = previous_weekly_tally[activity]['count']
                     if prev >= 1.0:
                         wow_count = 100.0 * (cur - prev) / prev
-                    cur = current_weekly_info[activity]['time']
+                    cur = weekly_info[week][activity]['time']
                     prev = previous_weekly_tally[activity]['time']
                     if prev > 1:
                         wow_time = 100.0 * (cur - prev) / prev
@@ -166,159 +284,195 @@ def get_wow_changes(weeks_ago=1):
     return wow_change
 
 
+@functools.lru_cache(maxsize=1)
 def get_weekly_info():
     """ Return a dictionary of weekly totals, counts and time in seonds, for each activity engaged during the week.
 
-    Weeks are based on the week of the year (01 - 52) calendar.
+    Weeks are based on the week of the year (01 - 52) calendar and keyed by
+    year * 100 + week number. Weeks are
+    ordered from oldest to newest and the activities within each week are
+    sorted by name, so callers can iterate the result without sorting it.
     """
+    columns = _load_columns()
+    code_to_name = columns['code_to_name']
+    num_codes = len(code_to_name)
+    week_key = columns['year'].astype(np.int32) * 100 + columns['week']
+    week_keys, week_idx = np.unique(week_key, return_inverse=True)
+    combined_idx = week_idx.ravel() * num_codes + columns['activity_code']
+    size = len(week_keys) * num_codes
+    counts = np.bincount(combined_idx, minlength=size).reshape(len(week_keys), num_codes)
+    times = np.bincount(combined_idx, weights=columns['delta'], minlength=size).reshape(len(week_keys), num_codes)
+
+    by_name = sorted(range(num_codes), key=code_to_name.__getitem__)
     weekly_info = {}
-    current_day = -1
-    current_week = -1
-    for activity, yr, week, day_of_week, time_delta in get_activity_timings():
-        if week < 10:
-            weekly_key = '{0}-0{1}'.format(yr, week)
-        else:
-            weekly_key = '{0}-{1}'.format(yr, week)
-        if weekly_key not in weekly_info:
-            weekly_info[weekly_key] = {}
-        if activity not in weekly_info[weekly_key]:
-            weekly_info[weekly_key][activity] = {'count': 1,
-                                                 'time': time_delta}
-        else:
-            weekly_info[weekly_key][activity]['count'] += 1
-            weekly_info[weekly_key][activity]['time'] += time_delta
+    for i, weekly_key in enumerate(week_keys.tolist()):  # np.unique keys are sorted
+        weekly_info[weekly_key] = {}
+        for code in by_name:
+            if not counts[i, code]:
+                continue
+            weekly_info[weekly_key][code_to_name[code]] = {'count': int(counts[i, code]),
+                                                           'time': int(times[i, code])}
     return weekly_info
 
 
+def clear_caches():
+    """Forget the parsed logs so the next report re-reads the log files.
+
+    The logs are parsed once and the results cached for the life of the
+    process. Call this to pick up entries logged since, eg. from a long
+    running notebook kernel.
+    """
+    get_activities_in_localtime.cache_clear()
+    get_ordered_activity_timestamps.cache_clear()
+    _get_all_activity_timings.cache_clear()
+    _load_columns.cache_clear()
+    get_weekly_info.cache_clear()
+
+
+def print_full_weekly_report(weeks_ago=1, timings=True, summary=True, wow=True):
+    """Print the weekly activity timings, summary and week over week changes.
+
+    The weekly info is walked once, printing the selected sections for each
+    week in turn. The week over week changes are only computed when printed.
+
+    :param int weeks_ago:  The number of weeks used to compute the average wow change.
+    :param bool timings:   Print the per activity counts and times for each week.
+    :param bool summary:   Print the total counts and time worked for each week.
+    :param bool wow:       Print the week over week change of each activity.
+    """
+    weekly_info = get_weekly_info()
+    wow_changes_info = get_wow_changes(weeks_ago) if wow else {}
+    for week in weekly_info:
+        if timings:
+            print('Week: {0}'.format(_format_week(week)))
+            for activity in weekly_info[week]:
+                cnt = weekly_info[week][activity]['count']
+                hrs = int(weekly_info[week][activity]['time'] / 3600)
+                mins = int(weekly_info[week][activity]['time'] % 60)
+                print('\tActivity: {0:<12s} Counts: {1:>3d}\tTime: {2:>3d} hrs, {3:2d} mins'.format(activity, cnt, hrs, mins))
+        if summary:
+            total_time = 0.0
+            total_count = 0
+            for activity in weekly_info[week]:
+                total_time += weekly_info[week][activity]['time']
+                total_count += weekly_info[week][activity]['count']
+            total_hours = int(total_time / 3600)
+            total_mins = int(total_time % 60)
+            print('Week: {0}\tActivity Counts: {1:>3d}\tWorked: {2:>3d} hrs, {3:>2d} mins'.format(_format_week(week), total_count, total_hours, total_mins))
+        if week in wow_changes_info:  # Earliest weeks have no wow change
+            print('Week: {0}'.format(_format_week(week)))
+            for activity in wow_changes_info[week]:
+                wow_count = wow_changes_info[week][activity]['wow_count']
+                wow_time = wow_changes_info[week][activity]['wow_time']
+                print('\t{0:<12s} WoW counts: {1:>6.1f}%\tWow time: {2:>6.1f}%'.format(activity, wow_count, wow_time))
+
+
 def print_wow_change(weeks_ago=1):
-    wow_changes_info = get_wow_changes(weeks_ago)
-    for week in sorted(wow_changes_info.keys()):
-        print('Week: {0}'.format(week))
-        for activity in sorted(wow_changes_info[week].keys()):
-            wow_count = wow_changes_info[week][activity]['wow_count']
-            wow_time = wow_changes_info[week][activity]['wow_time']
-            print('\t{0:<12s} WoW counts: {1:>6.1f}%\tWow time: {2:>6.1f}%'.format(activity, wow_count, wow_time))
+    print_full_weekly_report(weeks_ago, timings=False, summary=False)
 
 
 def print_weekly_timings():
-    weekly_info = get_weekly_info()
-    for week in sorted(weekly_info.keys()):
-        print('Week: {0}'.format(week))
-        for activity in sorted(weekly_info[week].keys()):
-            cnt = weekly_info[week][activity]['count']
-            hrs = int(weekly_info[week][activity]['time'] / 3600)
-            mins = int(weekly_info[week][activity]['time'] % 60)
-            print('\tActivity: {0:<12s} Counts: {1:>3d}\tTime: {2:>3d} hrs, {3:2d} mins'.format(activity, cnt, hrs, mins))
+    print_full_weekly_report(summary=False, wow=False)
 
 
 def print_weekly_summary_timings():
-    weekly_info = get_weekly_info()
-    for week in sorted(weekly_info.keys()):
-        total_time = 0.0
-        total_count = 0
-        for activity in weekly_info[week]:
-            total_time += weekly_info[week][activity]['time']
-            total_count += weekly_info[week][activity]['count']
-        total_hours = int(total_time / 3600)
-        total_mins = int(total_time % 60)
-        print('Week: {0}\tActivity Counts: {1:>3d}\tWorked: {2:>3d} hrs, {3:>2d} mins'.format(week, total_count, total_hours, total_mins))
+    print_full_weekly_report(timings=False, wow=False)
 
 
 def get_overall_actitivity_info():
     """Return an activity summation structure over all time.
 
     """
-    activity_cnts = {'weekday_cnt': 0,
-                     'weekend_cnt': 0}
+    columns = _load_columns()
+    codes = columns['activity_code']
+    weeks = columns['week']
+    days = columns['dow']
+    deltas = columns['delta']
+    weekdays = days < 6
+
+    # A new day starts whenever the day or week changes from the previous entry.
+    # Assumption is we don't skip a year of tracking
+    new_day = np.ones(len(days), dtype=bool)
+    new_day[1:] = (days[1:] != days[:-1]) | (weeks[1:] != weeks[:-1])
+    activity_cnts = {'weekday_cnt': int(np.count_nonzero(new_day & weekdays)),
+                     'weekend_cnt': int(np.count_nonzero(new_day & ~weekdays))}
+
+    total = int(deltas.sum())
     activities = {}
-    total = 0
-    current_day = -1
-    current_week = -1
-    for activity, yr, week, day_of_week, time_delta in get_activity_timings():
-        total += time_delta
-        if activity not in activities.keys():
-            activities[activity] = {'total_time': 0,
-                                    'weekday_timings': [],
-                                    'weekday_count': 0,
-                                    'weekend_timings': [],
-                                    'weekend_count': 0}
-        activities[activity]['total_time'] += time_delta
-        if day_of_week in range(1,6):  # Weekday
-            activities[activity]['weekday_timings'].append(time_delta)
-            activities[activity]['weekday_count'] += 1
-            if day_of_week != current_day or week != current_week:
-                # Assumption is we don't skip a year of tracking
-                current_day = day_of_week
-                current_week = week
-                activity_cnts['weekday_cnt'] += 1
-        else:  # Weekend
-            activities[activity]['weekend_timings'].append(time_delta)
-            activities[activity]['weekend_count'] += 1
-            if day_of_week != current_day or week != current_week:
-                # Assumption is we don't skip a year of tracking
-                current_day = day_of_week
-                current_week = week
-                activity_cnts['weekend_cnt'] += 1
-
-    for activity in activities.keys():
-        activities[activity]['percentage_totals'] = activities[activity]['total_time']*100.0/total
+    for code, activity in enumerate(columns['code_to_name']):
+        is_activity = codes == code
+        weekday_timings = deltas[is_activity & weekdays]
+        weekend_timings = deltas[is_activity & ~weekdays]
+        total_time = int(weekday_timings.sum() + weekend_timings.sum())
+        activities[activity] = {'total_time': total_time,
+                                'weekday_timings': weekday_timings,
+                                'weekday_count': len(weekday_timings),
+                                'weekend_timings': weekend_timings,
+                                'weekend_count': len(weekend_timings),
+                                'percentage_totals': total_time*100.0/total}
     activity_info = {'activities': activities,
                      'counts': activity_cnts}
     return activity_info
 
 
 def daily_statistics():
+    columns = _load_columns()
+    code_to_name = columns['code_to_name']
+    num_codes = len(code_to_name)
+    days = columns['dow']
+    deltas = columns['delta']
+    num_days = len(NUM_TO_DAY_MAP) + 1  # Days are numbered from 1
+
+    # A day is counted each time the day of week changes from the previous entry
+    new_day = np.ones(len(days), dtype=bool)
+    new_day[1:] = days[1:] != days[:-1]
+    day_cnts = np.bincount(days[new_day], minlength=num_days)
+    context_switches = np.bincount(days, minlength=num_days)
+    total_times = np.bincount(days, weights=deltas, minlength=num_days)
+    combined_idx = days.astype(np.int32) * num_codes + columns['activity_code']
+    size = num_days * num_codes
+    activity_cnts = np.bincount(combined_idx, minlength=size).reshape(num_days, num_codes)
+    activity_times = np.bincount(combined_idx, weights=deltas, minlength=size).reshape(num_days, num_codes)
+
     # Initialize returned data structure
     daily_statistics = {}
-    current_day = 0
-    for day in NUM_TO_DAY_MAP.keys():
-        daily_statistics[day] = {'context_switches': 0,
-                                 'day_cnts': 0,
-                                 'total_time': 0}
-    for activity, yr, week, day_of_week, time_delta in get_activity_timings():
-        if day_of_week != current_day:
-            try:
-                daily_statistics[day_of_week]['day_cnts'] += 1
-            except ValueError:
-                # First entry
-                pass
-            current_day = day_of_week
-        daily_statistics[day_of_week]['context_switches'] += 1
-        daily_statistics[day_of_week]['total_time'] += time_delta
-        if activity not in daily_statistics[day_of_week].keys():
-            daily_statistics[day_of_week][activity] = {'total_time': time_delta,
-                                                         'cnt': 1}
-        else:
-            daily_statistics[day_of_week][activity]['total_time'] += time_delta
-            daily_statistics[day_of_week][activity]['cnt'] += 1
+    for day in NUM_TO_DAY_MAP:
+        daily_statistics[day] = {'context_switches': int(context_switches[day]),
+                                 'day_cnts': int(day_cnts[day]),
+                                 'total_time': int(total_times[day])}
+        for code in np.flatnonzero(activity_cnts[day]).tolist():
+            daily_statistics[day][code_to_name[code]] = {'total_time': int(activity_times[day, code]),
+                                                         'cnt': int(activity_cnts[day, code])}
     return daily_statistics
 
 
 def show_percentage_pie_plot():
+    import matplotlib.pyplot as plt
+
     # Get data
     activity_info = get_overall_actitivity_info()
     activities = activity_info['activities']
 
     # make a square figure and axes
-    figure(1, figsize=(12,12))
-    ax = axes([0.1, 0.1, 0.8, 0.8])
+    plt.figure(1, figsize=(12,12))
+    ax = plt.axes([0.1, 0.1, 0.8, 0.8])
 
 
     # The slices will be ordered and plotted counter-clockwise.
-    key_list = [k for k in activities.keys() if activities[k]['percentage_totals'] > PERCENTAGE_CUTOFF]
+    key_list = [k for k in activities if activities[k]['percentage_totals'] > PERCENTAGE_CUTOFF]
     labels = key_list
     fracs = [activities[k]['percentage_totals'] for k in key_list]
     explode = [0.05 for k in key_list]
 
-    pie(fracs, explode=explode, labels=labels, autopct='%1.1f%%', shadow=True, startangle=90)
+    plt.pie(fracs, explode=explode, labels=labels, autopct='%1.1f%%', shadow=True, startangle=90)
                     # The default startangle is 0, which would start
                     # the Frogs slice on the x-axis.  With startangle=90,
                     # everything is rotated counter-clockwise by 90 degrees,
                     # so the plotting starts on the positive y-axis.
 
-    title('Acitiviy Log', bbox={'facecolor':'0.8', 'pad':5})
+    plt.title('Acitiviy Log', bbox={'facecolor':'0.8', 'pad':5})
 
-    show()
+    plt.show()
 
 
 def show_wow_activity_plot(activity='Coding', weeks=4):
@@ -330,18 +484,20 @@ def show_wow_activity_plot(activity='Coding', weeks=4):
     :param int weeks:     The number of preceding weeks used in the week-over-week
                           calculation.
     """
+    import matplotlib.pyplot as plt
+
     percentage_cap = 1000.0
     wow_changes = get_wow_changes(weeks_ago=weeks)
 
     # Order based on week
-    week_labels = sorted(wow_changes.keys())
-    week_axis = arange(0.0, len(week_labels), 1)
-    xticks(week_axis, week_labels, rotation='vertical')
+    week_labels = [_format_week(week) for week in wow_changes]
+    week_axis = np.arange(0.0, len(week_labels), 1)
+    plt.xticks(week_axis, week_labels, rotation='vertical')
 
     # Build up the Y-axis data set
     wow_cnt_change = []
     wow_time_change = []
-    for week in week_labels:
+    for week in wow_changes:
         if activity in wow_changes[week]:
             # Cap maximum
             if wow_changes[week][activity]['wow_count'] > percentage_cap:
@@ -356,22 +512,24 @@ def show_wow_activity_plot(activity='Coding', weeks=4):
             wow_cnt_change.append(0.0)
             wow_time_change.append(0.0)
 
-    xlabel('Week')
-    ylabel('Percentage')
-    title('Week over Week {0} Activity Change (Capped at 1000%)'.format(activity))
-    plot(week_axis, wow_cnt_change, label='Activity Cnts')
-    plot(week_axis, wow_time_change, label='Activity Time')
-    grid(True)
-    rcParams['figure.figsize'] = 20, 10  # Make width=20 inches, height= 10 inches
-    legend()
-    show()
+    plt.xlabel('Week')
+    plt.ylabel('Percentage')
+    plt.title('Week over Week {0} Activity Change (Capped at 1000%)'.format(activity))
+    plt.plot(week_axis, wow_cnt_change, label='Activity Cnts')
+    plt.plot(week_axis, wow_time_change, label='Activity Time')
+    plt.grid(True)
+    plt.rcParams['figure.figsize'] = 20, 10  # Make width=20 inches, height= 10 inches
+    plt.legend()
+    plt.show()
 
 
 def plot_day_activity_percentages():
+    import matplotlib.pyplot as plt
+
     # Get the list of activities which consume more than the cutoff percentage
     activity_info = get_overall_actitivity_info()
     activities = activity_info['activities']
-    activity_list = [k for k in activities.keys() if activities[k]['percentage_totals'] > PERCENTAGE_CUTOFF]
+    activity_list = [k for k in activities if activities[k]['percentage_totals'] > PERCENTAGE_CUTOFF]
 
     # Initialize our plot data structure
     daily_stats = daily_statistics()
@@ -385,75 +543,77 @@ def plot_day_activity_percentages():
             plot_data[day][activity] = percentage
 
     # Order based on day
-    day_labels = sorted(plot_data.keys())
-    day_axis = arange(0, len(day_labels), 1)
-    xticks(day_axis, NUM_TO_DAY_MAP.values(), rotation='vertical')
+    day_labels = sorted(plot_data)
+    day_axis = np.arange(0, len(day_labels), 1)
+    plt.xticks(day_axis, NUM_TO_DAY_MAP.values(), rotation='vertical')
 
-    xlabel('Day')
-    ylabel('Time Percentage')
-    title('Daily Percentage Of Time Spent On Activity')
+    plt.xlabel('Day')
+    plt.ylabel('Time Percentage')
+    plt.title('Daily Percentage Of Time Spent On Activity')
 
     # Plot each activity
     for activity in activity_list:
         y_data = []
         for day in day_labels:
             y_data.append(plot_data[day][activity])
-        plot(day_axis, y_data, label=activity)
+        plt.plot(day_axis, y_data, label=activity)
 
-    grid(True)
-    rcParams['figure.figsize'] = 20, 10  # Make width=20 inches, height= 10 inches
-    legend()
-    show()
+    plt.grid(True)
+    plt.rcParams['figure.figsize'] = 20, 10  # Make width=20 inches, height= 10 inches
+    plt.legend()
+    plt.show()
 
 
 def get_activity_statistics():
-    def average_mins(timing_list):
-        cnt = len(timing_list)
-        if cnt == 0:
+    def average_mins(timings):
+        if len(timings) == 0:
             return 0
         else:
-            return int(sum(timing_list) / cnt / 60.0)
+            return int(np.mean(timings) / 60.0)
 
-    def medium_mins(timing_list):
-        cnt = len(timing_list)
+    def median_mins(timings):
+        cnt = len(timings)
         if cnt == 0:
             return 0
-        else:
-            mid = int(cnt/2)
-            return int(sorted(timing_list)[mid] / 60.0)
+        mid = cnt // 2
+        if cnt % 2:
+            return int(np.partition(timings, mid)[mid] / 60.0)
+        # Even number of timings, average the two middle ones
+        middle = np.partition(timings, [mid - 1, mid])[mid - 1:mid + 1]
+        return int(middle.mean() / 60.0)
 
     activity_info = get_overall_actitivity_info()
     activities = activity_info['activities']
     activity_counts = activity_info['counts']
     print('Weekday Stats:')
     print('==============\n')
-    print('Activity | cnt |  avg |  medium')
+    print('Activity | cnt |  avg |  median')
     print('         |     | mins |    mins')
     print('---------+-----+------+--------')
     total_work_time = 0
-    for activity in activities.keys():
+    for activity in activities:
         print('{0:<8} | {1:>3} | {2:>4} | {3:>7}'.format(activity,
                                            activities[activity]['weekday_count'],
                                            average_mins(activities[activity]['weekday_timings']),
-                                           medium_mins(activities[activity]['weekday_timings'])))
+                                           median_mins(activities[activity]['weekday_timings'])))
 
         print('---------+-----+------+--------')
-        total_work_time += sum(activities[activity]['weekday_timings'])
+        total_work_time += activities[activity]['weekday_timings'].sum()
     print('Total days: {0}'.format(activity_counts['weekday_cnt']))
     print('Average work day (mins): {0}'.format(int(total_work_time / activity_counts['weekday_cnt'] / 60)))
     print('\nWeekend Stats:')
     print('==============\n')
-    print('Activity | cnt |  avg |  medium')
+    print('Activity | cnt |  avg |  median')
     print('         |     | mins |    mins')
     print('---------+-----+------+--------')
     total_work_time = 0
-    for activity in activities.keys():
+    for activity in activities:
         print('{0:<8} | {1:>3} | {2:>4} | {3:>7}'.format(activity,
                                            activities[activity]['weekend_count'],
                                            average_mins(activities[activity]['weekend_timings']),
-                                           medium_mins(activities[activity]['weekend_timings'])))
+                                           median_mins(activities[activity]['weekend_timings'])))
         print('---------+-----+------+--------')
-        total_work_time += sum(activities[activity]['weekend_timings'])
+        total_work_time += activities[activity]['weekend_timings'].sum()
     print('Total days: {0}'.format(activity_counts['weekend_cnt']))
     print('Average work day (mins): {0}'.format(int(total_work_time / activity_counts['weekend_cnt'] / 60)))
 
@@ -461,13 +621,13 @@ def get_activity_statistics():
 def get_daily_statistics():
     daily_stats = daily_statistics()
     activities = set([])
-    for day in NUM_TO_DAY_MAP.keys():
-        activities = activities.union(daily_stats[day].keys())
+    for day in NUM_TO_DAY_MAP:
+        activities = activities.union(daily_stats[day])
     activities = activities.difference(set(['day_cnts', 'total_time', 'context_switches']))
     activities = sorted(list(activities))
     print('Day | Activity | Percenatage')
     sep = ('----+----------+------------')
-    for day in NUM_TO_DAY_MAP.keys():
+    for day in NUM_TO_DAY_MAP:
         print(sep)
         sep = ('    +----------+------------')
         day_string = '{0} '.format(NUM_TO_DAY_MAP[day])